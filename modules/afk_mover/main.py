@@ -114,6 +114,7 @@ class AfkMover(Thread):
             for client in self.afk_list
             if client.get("client_away", "1") == "0"
             and int(client.get("cid", "-1")) == int(self.afk_channel)
+            and int(client.get("clid", "-1")) in self.client_channels
         ]
         return clientlist
 
@@ -130,7 +131,7 @@ class AfkMover(Thread):
 
         try:
             self.ts3conn.clientmove(self.get_channel_by_name(channel_name), client_id)
-            del self.client_channels[str(client_id)]
+            del self.client_channels[int(client_id)]
         except KeyError:
             AfkMover.logger.error(
                 "Error moving client! clid=%s not found in %s",
@@ -145,7 +146,7 @@ class AfkMover(Thread):
         Move all clients who are back from afk.
         """
         back_list = self.get_back_list()
-        if back_list is None:
+        if len(back_list) == 0:
             AfkMover.logger.debug("move_all_back back list is empty. Nothing todo.")
             return
 
@@ -156,7 +157,7 @@ class AfkMover(Thread):
         )
 
         try:
-            channel_list = self.ts3conn.channellist()
+            channel_list = self.ts3conn.channellist(["limits", "flags"])
         except TS3QueryException as query_exception:
             AfkMover.logger.error(
                 "Failed to get the current channellist: %s",
@@ -164,13 +165,14 @@ class AfkMover(Thread):
             )
             return
 
+        channels_by_cid = {int(channel["cid"]): channel for channel in channel_list}
+
         for client in back_list:
-            if client.get("clid", -1) not in self.client_channels:
-                continue
+            client_id = int(client.get("clid", "-1"))
 
             AfkMover.logger.info(
                 "Moving the client clid=%s client_nickname=%s back!",
-                int(client.get("clid", -1)),
+                client_id,
                 str(client.get("client_nickname", -1)),
             )
             AfkMover.logger.debug("Client: %s", str(client))
@@ -178,32 +180,16 @@ class AfkMover(Thread):
                 "Saved channel list keys: %s", str(self.client_channels)
             )
 
-            channel_id = int(self.client_channels.get(client.get("clid", -1)))
-            client_id = int(client.get("clid", "-1"))
-
-            try:
-                channel_info = self.ts3conn._parse_resp_to_dict(
-                    self.ts3conn._send("channelinfo", [f"cid={channel_id}"])
-                )
-            except TS3QueryException as query_exception:
-                # Error: invalid channel ID (channel ID does not exist (anymore))
-                if int(query_exception.id) == 768:
-                    AfkMover.logger.error(
-                        "Failed to get channelinfo as the channel does not exist anymore: %s",
-                        str(client),
-                    )
-                    continue
+            channel_id = self.client_channels[client_id]
 
-            channel_details = None
-            for channel in channel_list:
-                if int(channel["cid"]) == channel_id:
-                    channel_details = channel
-                    break
+            # a missing channel has usually been deleted meanwhile,
+            # which the error handling of clientmove takes care of
+            channel_details = channels_by_cid.get(channel_id)
 
             if RESP_CHANNEL_SETTINGS and channel_details is not None:
-                if int(channel_info.get("channel_maxclients")) != -1 and int(
+                if int(channel_details.get("channel_maxclients")) != -1 and int(
                     channel_details.get("total_clients")
-                ) >= int(channel_info.get("channel_maxclients")):
+                ) >= int(channel_details.get("channel_maxclients")):
                     AfkMover.logger.warning(
                         "Failed to move back the following client as the channel has already the maximum of clients: %s",
                         str(client),
@@ -211,7 +197,7 @@ class AfkMover(Thread):
                     self.fallback_action(client_id)
                     continue
 
-                if int(channel_info.get("channel_flag_password")):
+                if int(channel_details.get("channel_flag_password")):
                     AfkMover.logger.warning(
                         "Failed to move back the following client as the channel has a password: %s",
                         str(client),
@@ -222,7 +208,7 @@ class AfkMover(Thread):
             try:
                 self.ts3conn.clientmove(channel_id, client_id)
 
-                del self.client_channels[str(client_id)]
+                del self.client_channels[client_id]
             except TS3QueryException as query_exception:
                 # Error: invalid channel ID (channel ID does not exist (anymore))
                 if int(query_exception.id) == 768:
@@ -263,6 +249,7 @@ class AfkMover(Thread):
             channel_list = self.ts3conn.channellist()
         except TS3QueryException:
             AfkMover.logger.exception("Failed to get the list of available channels.")
+            return channel_ids_to_ignore
 
         for channel in channel_list:
             if any(
@@ -275,11 +262,11 @@ class AfkMover(Thread):
 
     def update_servergroup_ids_list(self):
         """
-        Updates the list of servergroup IDs, which should be ignored.
+        Updates the set of servergroup IDs, which should be ignored.
         """
-        self.servergroup_ids_to_ignore = []
+        self.servergroup_ids_to_ignore = frozenset()
 
-        if SERVERGROUPS_TO_EXCLUDE is None:
+        if not SERVERGROUPS_TO_EXCLUDE:
             AfkMover.logger.debug("No servergroups to exclude defined. Nothing todo.")
             return
 
@@ -289,11 +276,13 @@ class AfkMover(Thread):
             AfkMover.logger.exception(
                 "Failed to get the list of available servergroups."
             )
+            return
 
-        self.servergroup_ids_to_ignore.clear()
-        for servergroup in servergroup_list:
-            if servergroup.get("name") in SERVERGROUPS_TO_EXCLUDE.split(","):
-                self.servergroup_ids_to_ignore.append(servergroup.get("sgid"))
+        self.servergroup_ids_to_ignore = frozenset(
+            servergroup.get("sgid")
+            for servergroup in servergroup_list
+            if servergroup.get("name") in SERVERGROUPS_TO_EXCLUDE
+        )
 
     def get_servergroups_by_client(self, cldbid):
         """
@@ -373,7 +362,7 @@ class AfkMover(Thread):
                     )
                     continue
 
-            if SERVERGROUPS_TO_EXCLUDE is not None:
+            if SERVERGROUPS_TO_EXCLUDE:
                 client_is_in_group = False
                 for client_servergroup_id in self.get_servergroups_by_client(
                     client.get("client_database_id")
@@ -420,8 +409,8 @@ class AfkMover(Thread):
                     self.ts3conn.clientmove(
                         self.afk_channel, int(client.get("clid", "-1"))
                     )
-                    self.client_channels[client.get("clid", "-1")] = client.get(
-                        "cid", "0"
+                    self.client_channels[int(client.get("clid", "-1"))] = int(
+                        client.get("cid", "0")
                     )
                 except TS3Exception:
                     AfkMover.logger.exception(
@@ -535,8 +524,8 @@ def client_left(event_data):
     """
     # Forget clients that were set to afk and then left
     if PLUGIN_INFO is not None:
-        if str(event_data.client_id) in PLUGIN_INFO.client_channels:
-            del PLUGIN_INFO.client_channels[str(event_data.client_id)]
+        if int(event_data.client_id) in PLUGIN_INFO.client_channels:
+            del PLUGIN_INFO.client_channels[int(event_data.client_id)]
 
 
 @setup_plugin
@@ -562,7 +551,11 @@ def setup(
     DRY_RUN = enable_dry_run
     CHECK_FREQUENCY_SECONDS = frequency
     CHANNELS_TO_EXCLUDE = exclude_channels
-    SERVERGROUPS_TO_EXCLUDE = exclude_servergroups
+    SERVERGROUPS_TO_EXCLUDE = frozenset(
+        servergroup_name.strip()
+        for servergroup_name in (exclude_servergroups or "").split(",")
+        if servergroup_name.strip()
+    )
     ENABLE_AUTO_MOVE_BACK = auto_move_back
     RESP_CHANNEL_SETTINGS = respect_channel_settings
     FALLBACK_ACTION = fallback_channel
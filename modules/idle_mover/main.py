@@ -1,12 +1,15 @@
 # standard imports
 import logging
+import logging.handlers
 import threading
 import traceback
 from threading import Thread
 from typing import Union
 import sys
 import re
+import time
 from copy import deepcopy
+from dataclasses import dataclass
 
 # third-party imports
 from ts3API.Events import ClientLeftEvent
@@ -20,6 +23,7 @@ import teamspeak_bot
 PLUGIN_VERSION = 0.3
 PLUGIN_COMMAND_NAME = "idlemover"
 PLUGIN_INFO: Union[None, "IdleMover"] = None
+PLUGIN_CONFIG: Union[None, "IdleMoverConfig"] = None
 PLUGIN_STOPPER = threading.Event()
 BOT: teamspeak_bot.Ts3Bot
 
@@ -34,12 +38,36 @@ RESP_CHANNEL_SETTINGS = True
 FALLBACK_ACTION = None
 IDLE_TIME_SECONDS = 600.0
 CHANNEL_NAME = "AFK"
-CHANNEL_SETTINGS = None
+
+# members of the excluded servergroups are refreshed every this amount of seconds
+SERVERGROUP_MEMBERS_REFRESH_SECONDS = 300.0
+# resolved channel names are refreshed every this amount of seconds
+CHANNEL_IDS_REFRESH_SECONDS = 300.0
+# the check frequency is doubled up to this many times while nothing happens
+MAX_CHECK_FREQUENCY_BACKOFF = 2
+
+
+@dataclass(frozen=True)
+class IdleMoverConfig:
+    """
+    Configuration of the IdleMover, which is created once by `setup`.
+    """
+
+    dry_run: bool
+    check_frequency_seconds: float
+    channels_to_exclude: Union[None, str]
+    servergroups_to_exclude: frozenset
+    enable_auto_move_back: bool
+    resp_channel_settings: bool
+    fallback_action: Union[None, str]
+    idle_time_ms: float
+    channel_name: str
+    channel_settings: dict
 
 
 class IdleMover(Thread):
     """
-    IdleMover class. Moves clients which are idle since more than `IDLE_TIME_SECONDS` seconds to the channel `CHANNEL_NAME`.
+    IdleMover class. Moves clients which are idle since more than `min_idle_time_seconds` seconds to the afk channel.
     """
 
     # configure logger
@@ -47,38 +75,62 @@ class IdleMover(Thread):
     logger = logging.getLogger(class_name)
     logger.propagate = 0
     logger.setLevel(logging.INFO)
-    file_handler = logging.FileHandler(f"logs/{class_name.lower()}.log", mode="a+")
+    file_handler = logging.handlers.RotatingFileHandler(
+        f"logs/{class_name.lower()}.log", maxBytes=5_000_000, backupCount=3
+    )
     formatter = logging.Formatter("%(asctime)s: %(levelname)s: %(message)s")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # buffer log records and write them in bulk or as soon as a warning occurs
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=200, flushLevel=logging.WARNING, target=file_handler
+    )
+    logger.addHandler(memory_handler)
     logger.info("Configured %s logger", str(class_name))
     logger.propagate = 0
 
-    def __init__(self, stop_event, ts3conn):
+    def __init__(self, stop_event, ts3conn, config):
         """
         Create a new IdleMover object.
         :param stop_event: Event to signalize the IdleMover to stop.
         :type stop_event: threading.Event
         :param ts3conn: Connection to use
         :type: TS3Connection
+        :param config: Configuration to use
+        :type config: IdleMoverConfig
         """
         Thread.__init__(self)
         self.stopped = stop_event
         self.ts3conn = ts3conn
+        self.cfg = config
+
+        self.channel_ids_by_name = {}
 
-        self.afk_channel = self.get_channel_by_name(CHANNEL_NAME)
+        self.afk_channel = self.get_channel_by_name(self.cfg.channel_name)
         if self.afk_channel is None:
             IdleMover.logger.error("Could not get afk channel")
+        self.channel_ids_refresh_at = time.monotonic() + CHANNEL_IDS_REFRESH_SECONDS
 
         self.channel_ids_to_ignore = []
         self.channel_ids_to_ignore = self.update_channel_ids_list()
 
-        self.servergroup_ids_to_ignore = []
+        self.servergroup_ids_to_ignore = frozenset()
         self.servergroup_ids_to_ignore = self.update_servergroup_ids_list()
 
+        self.excluded_cldbids = set()
+        self.excluded_cldbids = self.update_excluded_cldbids()
+        self.excluded_cldbids_refresh_at = (
+            time.monotonic() + SERVERGROUP_MEMBERS_REFRESH_SECONDS
+        )
+
         self.channel_configs = []
-        self.channel_configs = self.parse_channel_settings(CHANNEL_SETTINGS)
+        self.channel_configs = self.parse_channel_settings(self.cfg.channel_settings)
 
+        self.min_idle_time_ms_by_cid = {
+            int(config["channel_id"]): float(config["min_idle_time_seconds"]) * 1000.0
+            for config in self.channel_configs
+        }
+
+        self.client_list = []
         self.idling_clients = {}
 
     def run(self):
@@ -94,7 +146,7 @@ class IdleMover(Thread):
     def update_client_list(self):
         """
         Update list of clients with idle time.
-        :return: List of connected clients with their idle time.
+        :return: List of connected clients as tuples of (clid, cid, cldbid, idle time in ms, nickname).
         """
         client_list = []
 
@@ -108,15 +160,28 @@ class IdleMover(Thread):
             if int(client.get("client_type")) == 1:
                 IdleMover.logger.debug(
                     "update_client_list ignoring ServerQuery client: %s",
+                    client,
+                )
+                continue
+
+            if not all(key in client.keys() for key in ("client_idle_time", "cid")):
+                IdleMover.logger.warning(
+                    "update_client_list client is either missing `client_idle_time` or `cid`: %s!",
                     str(client),
                 )
                 continue
 
-            client_list.append(client)
+            client_list.append(
+                (
+                    int(client.get("clid")),
+                    int(client.get("cid")),
+                    int(client.get("client_database_id")),
+                    int(client.get("client_idle_time")),
+                    client.get("client_nickname"),
+                )
+            )
 
-        IdleMover.logger.debug(
-            "Updated client list with idle times: %s", str(client_list)
-        )
+        IdleMover.logger.debug("Updated client list with idle times: %s", client_list)
 
         return client_list
 
@@ -126,7 +191,7 @@ class IdleMover(Thread):
         """
         channel_ids_to_ignore = []
 
-        if CHANNELS_TO_EXCLUDE is None:
+        if self.cfg.channels_to_exclude is None:
             IdleMover.logger.debug("No channels to exclude defined. Nothing todo.")
             return channel_ids_to_ignore
 
@@ -134,23 +199,24 @@ class IdleMover(Thread):
             channel_list = self.ts3conn.channellist()
         except TS3QueryException:
             IdleMover.logger.exception("Failed to get the list of available channels.")
+            return channel_ids_to_ignore
 
         for channel in channel_list:
             if any(
                 re.search(channel_name_pattern, channel.get("channel_name"))
-                for channel_name_pattern in CHANNELS_TO_EXCLUDE.split(",")
+                for channel_name_pattern in self.cfg.channels_to_exclude.split(",")
             ):
-                channel_ids_to_ignore.append(channel.get("cid"))
+                channel_ids_to_ignore.append(int(channel.get("cid")))
 
         return channel_ids_to_ignore
 
     def update_servergroup_ids_list(self):
         """
-        Updates the list of servergroup IDs, which should be ignored.
+        Updates the set of servergroup IDs, which should be ignored.
         """
-        servergroup_ids_to_ignore = []
+        servergroup_ids_to_ignore = frozenset()
 
-        if SERVERGROUPS_TO_EXCLUDE is None:
+        if not self.cfg.servergroups_to_exclude:
             IdleMover.logger.debug("No servergroups to exclude defined. Nothing todo.")
             return servergroup_ids_to_ignore
 
@@ -160,12 +226,13 @@ class IdleMover(Thread):
             IdleMover.logger.exception(
                 "Failed to get the list of available servergroups."
             )
+            return servergroup_ids_to_ignore
 
-        for servergroup in servergroup_list:
-            if servergroup.get("name") in SERVERGROUPS_TO_EXCLUDE.split(","):
-                servergroup_ids_to_ignore.append(servergroup.get("sgid"))
-
-        return servergroup_ids_to_ignore
+        return frozenset(
+            servergroup.get("sgid")
+            for servergroup in servergroup_list
+            if servergroup.get("name") in self.cfg.servergroups_to_exclude
+        )
 
     def parse_channel_settings(self, channel_settings):
         """
@@ -215,219 +282,169 @@ class IdleMover(Thread):
 
         return channel_configs
 
-    def get_servergroups_by_client(self, cldbid):
+    def update_excluded_cldbids(self):
         """
-        Returns the list of servergroup IDs, which the client is assigned to.
-        :param: cldbid: The client database ID.
-        :returns: List of servergroup IDs assigned to the client.
+        Updates the set of client database IDs, which are member of a servergroup, which should be ignored.
+        :returns: Set of client database IDs, which should be ignored.
         """
-        client_servergroup_ids = []
+        excluded_cldbids = set()
 
-        try:
-            client_servergroups = self.ts3conn._parse_resp_to_list_of_dicts(
-                self.ts3conn._send("servergroupsbyclientid", [f"cldbid={cldbid}"])
-            )
-        except TS3QueryException:
-            IdleMover.logger.exception(
-                "Failed to get the list of assigned servergroups for the client cldbid=%s.",
-                int(cldbid),
-            )
-            return client_servergroup_ids
+        for sgid in self.servergroup_ids_to_ignore:
+            try:
+                servergroup_clients = self.ts3conn._parse_resp_to_list_of_dicts(
+                    self.ts3conn._send("servergroupclientlist", [f"sgid={sgid}"])
+                )
+            except TS3QueryException as query_exception:
+                # Error: database empty result set (servergroup has no members)
+                if int(query_exception.id) == 1281:
+                    continue
+
+                IdleMover.logger.exception(
+                    "Failed to get the list of clients of the servergroup sgid=%s.",
+                    int(sgid),
+                )
+                continue
 
-        for servergroup in client_servergroups:
-            client_servergroup_ids.append(servergroup.get("sgid"))
+            for servergroup_client in servergroup_clients:
+                excluded_cldbids.add(int(servergroup_client.get("cldbid")))
 
         IdleMover.logger.debug(
-            "client_database_id=%s has these servergroups: %s",
-            int(cldbid),
-            str(client_servergroup_ids),
+            "These client database IDs will be ignored: %s", excluded_cldbids
         )
 
-        return client_servergroup_ids
+        return excluded_cldbids
 
-    def get_idle_list(self):
+    def forget_client(self, clid):
         """
-        Get list of clients which are idle since more than `IDLE_TIME_SECONDS` seconds.
-        :return: List of clients which are idle.
+        Removes all cached data of a client, which left the server.
+        :param clid: The client ID.
+        """
+        self.idling_clients.pop(int(clid), None)
+
+    def get_idle_and_back_lists(self):
+        """
+        Get the clients which are idle since more than `min_idle_time_seconds` seconds and the clients,
+        which are in the afk channel, but not idle anymore, with a single pass over the client list.
+        :return: Tuple of the list of idle clients and the dict of clients to move back by clid.
         """
         client_idle_list = []
+        client_back_list = {}
 
-        client_list = self.update_client_list()
+        client_list = self.client_list
 
         if len(client_list) == 0:
             IdleMover.logger.debug(
                 "No client is connected to the server. Nothing todo."
             )
-            return client_idle_list
+            self.idling_clients.clear()
+            return client_idle_list, client_back_list
 
-        IdleMover.logger.debug(
-            "get_idle_list current idle list: %s!", str(self.idling_clients)
-        )
+        # log snapshots, as buffered records are formatted only when they are flushed
+        if IdleMover.logger.isEnabledFor(logging.DEBUG):
+            IdleMover.logger.debug("current idle list: %s!", dict(self.idling_clients))
+
+        cfg = self.cfg
+        afk_cid = int(self.afk_channel)
+        min_idle_time_ms_by_cid = self.min_idle_time_ms_by_cid
+        default_min_idle_time_ms = cfg.idle_time_ms
+        idling_clients = self.idling_clients
+        connected_clids = set()
 
         for client in client_list:
-            IdleMover.logger.debug("get_idle_list checking client: %s", str(client))
+            client_clid, client_cid, client_cldbid, client_idle_time_ms, _ = client
+            connected_clids.add(client_clid)
+            IdleMover.logger.debug("checking client: %s", client)
 
-            if not all(key in client.keys() for key in ("client_idle_time", "cid")):
-                IdleMover.logger.warning(
-                    "get_idle_list client is either missing `client_idle_time` or `cid`: %s!",
-                    str(client),
-                )
-                continue
+            # the client may have been forgotten by `client_left` meanwhile
+            old_cid = idling_clients.get(client_clid)
 
-            client_cid = client.get("cid", "-1")
+            if old_cid is not None:
+                if client_cid != afk_cid:
+                    IdleMover.logger.debug(
+                        "get_back_list client is not in the afk_channel anymore: %s!",
+                        client,
+                    )
+                    idling_clients.pop(client_clid, None)
+                else:
+                    min_idle_time_ms = min_idle_time_ms_by_cid.get(
+                        old_cid, default_min_idle_time_ms
+                    )
 
-            if int(client_cid) == int(self.afk_channel):
+                    if client_idle_time_ms > min_idle_time_ms:
+                        IdleMover.logger.debug(
+                            "get_back_list client is greater then %s seconds idle: %s!",
+                            int(min_idle_time_ms / 1000),
+                            client,
+                        )
+                    else:
+                        IdleMover.logger.debug(
+                            "get_back_list adding client to list: %s!", client
+                        )
+                        client_back_list[client_clid] = old_cid
+
+                    continue
+
+            if client_cid == afk_cid:
                 IdleMover.logger.debug(
                     "get_idle_list client is already in the afk_channel: %s!",
-                    str(client),
+                    client,
                 )
                 continue
 
-            if CHANNELS_TO_EXCLUDE is not None:
+            if cfg.channels_to_exclude is not None:
                 if client_cid in self.channel_ids_to_ignore:
                     IdleMover.logger.debug(
                         "The client is in a channel, which should be ignored: %s",
-                        str(client),
+                        client,
                     )
                     continue
 
-            if SERVERGROUPS_TO_EXCLUDE is not None:
-                client_is_in_group = False
-                for client_servergroup_id in self.get_servergroups_by_client(
-                    client.get("client_database_id")
-                ):
-                    if client_servergroup_id in self.servergroup_ids_to_ignore:
-                        IdleMover.logger.debug(
-                            "The client is in the servergroup sgid=%s, which should be ignored: %s",
-                            int(client_servergroup_id),
-                            str(client),
-                        )
-                        client_is_in_group = True
-                        break
-
-                if client_is_in_group:
-                    continue
+            if client_cldbid in self.excluded_cldbids:
+                IdleMover.logger.debug(
+                    "The client is in a servergroup, which should be ignored: %s",
+                    client,
+                )
+                continue
 
-            try:
-                channel_config = [
-                    conf
-                    for conf in self.channel_configs
-                    if int(conf["channel_id"]) == int(client_cid)
-                ][0]
-            except IndexError:
-                channel_config = None
-
-            if channel_config is None:
-                min_idle_time_seconds = float(IDLE_TIME_SECONDS)
-            else:
-                min_idle_time_seconds = float(channel_config["min_idle_time_seconds"])
+            min_idle_time_ms = min_idle_time_ms_by_cid.get(
+                client_cid, default_min_idle_time_ms
+            )
 
-            if int(client.get("client_idle_time")) / 1000 < float(
-                min_idle_time_seconds
-            ):
+            if client_idle_time_ms < min_idle_time_ms:
                 IdleMover.logger.debug(
                     "get_idle_list client is less then %s seconds idle: %s!",
-                    int(IDLE_TIME_SECONDS),
-                    str(client),
+                    int(min_idle_time_ms / 1000),
+                    client,
                 )
                 continue
 
             IdleMover.logger.debug(
-                "get_idle_list adding client to list: %s!", str(client)
+                "get_idle_list adding client to list: clid=%s!", client_clid
             )
             client_idle_list.append(client)
 
-        IdleMover.logger.debug(
-            "get_idle_list updated idle list: %s!", str(client_idle_list)
-        )
-
-        return client_idle_list
-
-    def get_back_list(self):
-        """
-        Get list of clients which are in the afk channel, but not idle anymore.
-        :return: List of clients which are not idle anymore.
-        """
-        client_back_list = {}
-
-        if len(self.idling_clients) == 0:
-            IdleMover.logger.debug("get_back_list idle_list is None!")
-            return client_back_list
-
-        for client_clid, client_cid in self.idling_clients.items():
+        # forget idling clients, which are not connected anymore
+        for client_clid in idling_clients.keys() - connected_clids:
             IdleMover.logger.debug(
-                "get_back_list checking client clid=%s", int(client_clid)
+                "client is not connected anymore: clid=%s!", client_clid
             )
+            idling_clients.pop(client_clid, None)
 
-            try:
-                client_info = self.ts3conn.clientinfo(client_clid)
-            except TS3Exception:
-                IdleMover.logger.exception(
-                    "Failed to get the client info of clid=%s.", int(client_clid)
-                )
-                raise
-
-            if not all(
-                key in client_info.keys() for key in ("client_idle_time", "cid")
-            ):
-                IdleMover.logger.warning(
-                    "get_back_list client is either missing `client_idle_time` or `cid`: %s!",
-                    str(client_info),
-                )
-                continue
-
-            if int(client_info.get("cid", "-1")) != int(self.afk_channel):
-                IdleMover.logger.debug(
-                    "get_back_list client is not in the afk_channel anymore: client_database_id=%s, client_nickname=%s!",
-                    int(client_info.get("client_database_id")),
-                    str(client_info.get("client_nickname")),
-                )
-                del self.idling_clients[int(client_clid)]
-                continue
+        IdleMover.logger.debug("updated idle list: %s!", client_idle_list)
+        IdleMover.logger.debug("updated back list: %s!", client_back_list)
 
-            try:
-                channel_config = [
-                    conf
-                    for conf in self.channel_configs
-                    if int(conf["channel_id"]) == int(client_cid)
-                ][0]
-            except IndexError:
-                channel_config = None
-
-            if channel_config is None:
-                min_idle_time_seconds = float(IDLE_TIME_SECONDS)
-            else:
-                min_idle_time_seconds = float(channel_config["min_idle_time_seconds"])
-
-            if int(client_info.get("client_idle_time")) / 1000 > float(
-                min_idle_time_seconds
-            ):
-                IdleMover.logger.debug(
-                    "get_back_list client is greater then %s seconds idle: client_database_id=%s, client_nickname=%s!",
-                    int(IDLE_TIME_SECONDS),
-                    int(client_info.get("client_database_id")),
-                    str(client_info.get("client_nickname")),
-                )
-                continue
-
-            IdleMover.logger.debug(
-                "get_back_list adding client to list: client_database_id=%s, client_nickname=%s!",
-                int(client_info.get("client_database_id")),
-                str(client_info.get("client_nickname")),
-            )
-            client_back_list[int(client_clid)] = int(client_cid)
-
-        IdleMover.logger.debug(
-            "get_back_list updated client list: %s!", str(client_back_list)
-        )
-        return client_back_list
+        return client_idle_list, client_back_list
 
     def get_channel_by_name(self, name="AFK"):
         """
         Get the channel id of the channel specified by name.
+        The result is cached until the cache gets refreshed by `auto_move_all`.
         :param name: Channel name
         :return: Channel id
         """
+        if name in self.channel_ids_by_name:
+            return self.channel_ids_by_name[name]
+
         try:
             channel = self.ts3conn.channelfind(name)[0].get("cid", "-1")
         except TS3Exception:
@@ -435,101 +452,151 @@ class IdleMover(Thread):
                 "Error while finding a channel with the name `%s`.", str(name)
             )
             raise
+
+        self.channel_ids_by_name[name] = channel
         return channel
 
-    def move_to_afk(self):
+    def move_to_afk(self, idle_list):
         """
         Move clients to the `afk_channel`.
+        :param idle_list: List of idle clients to move.
+        :return: Number of moved clients.
         """
-        idle_list = self.get_idle_list()
+        moved_clients = 0
 
         if len(idle_list) == 0:
             IdleMover.logger.debug("move_to_afk idle list is empty. Nothing todo.")
-            return
+            return moved_clients
 
         IdleMover.logger.debug("Moving clients to afk!")
 
-        for client in idle_list:
-            if DRY_RUN:
-                IdleMover.logger.info("I would have moved this client: %s", str(client))
+        for client_clid, client_cid, _, _, client_nickname in idle_list:
+            if self.cfg.dry_run:
+                IdleMover.logger.info(
+                    "I would have moved this client: clid=%s client_nickname=%s",
+                    client_clid,
+                    str(client_nickname),
+                )
             else:
                 IdleMover.logger.info(
                     "Moving the client clid=%s client_nickname=%s to afk!",
-                    int(client.get("clid", "-1")),
-                    str(client.get("client_nickname", "-1")),
+                    client_clid,
+                    str(client_nickname),
                 )
-                IdleMover.logger.debug("Client: %s", str(client))
 
+        if self.cfg.dry_run:
+            # count the clients, which would have been moved, so the check frequency does not back off
+            return len(idle_list)
+
+        client_clids = [client[0] for client in idle_list]
+
+        try:
+            self.move_clients(self.afk_channel, client_clids)
+            moved_clients += len(client_clids)
+        except TS3QueryException:
+            IdleMover.logger.warning(
+                "Failed to move all idle clients at once. Moving them one by one."
+            )
+
+            for client_clid in client_clids:
                 try:
-                    self.ts3conn.clientmove(
-                        self.afk_channel, int(client.get("clid", "-1"))
+                    self.ts3conn.clientmove(self.afk_channel, client_clid)
+                    moved_clients += 1
+                except TS3QueryException as query_exception:
+                    # Error: already member of channel (moved by the failed batch)
+                    if int(query_exception.id) == 770:
+                        moved_clients += 1
+                        continue
+
+                    IdleMover.logger.exception(
+                        "Error moving client! clid=%s", client_clid
                     )
                 except TS3Exception:
                     IdleMover.logger.exception(
-                        "Error moving client! clid=%s", int(client.get("clid", "-1"))
+                        "Error moving client! clid=%s", client_clid
                     )
 
-                self.idling_clients[int(client.get("clid", "-1"))] = int(
-                    client.get("cid", "0")
-                )
+        for client_clid, client_cid, _, _, _ in idle_list:
+            self.idling_clients[client_clid] = client_cid
+
+        if IdleMover.logger.isEnabledFor(logging.DEBUG):
+            IdleMover.logger.debug("Idling clients: %s", dict(self.idling_clients))
 
-        IdleMover.logger.debug("Idling clients: %s", str(self.idling_clients))
+        return moved_clients
 
-    def move_all_afk(self):
+    def move_clients(self, channel_id, client_ids):
+        """
+        Move multiple clients to the same channel with a single query.
+        Depends on `TS3Connection._send` escaping only the arguments and not the command itself,
+        as the pipes between the clids would be escaped otherwise.
+        :param channel_id: The channel ID, where the clients should be moved to.
+        :param client_ids: List of client IDs, which should be moved.
+        """
+        client_ids_param = "|".join(
+            f"clid={int(client_id)}" for client_id in client_ids
+        )
+        self.ts3conn._send(f"clientmove {client_ids_param}", [f"cid={int(channel_id)}"])
+
+    def move_all_afk(self, idle_list):
         """
         Move all idle clients.
+        :param idle_list: List of idle clients to move.
+        :return: Number of moved clients.
         """
         try:
-            self.move_to_afk()
+            return self.move_to_afk(idle_list)
         except AttributeError:
             IdleMover.logger.exception("Connection error!")
 
+        return 0
+
     def fallback_action(self, client_id):
         """
         In case if a client couldn't be moved, this function decides if the user should simply stay in the
         AFK channel or if he should be moved to an alternative channel.
         :param client_id: The client ID, which should be moved
         """
-        if FALLBACK_ACTION is None or FALLBACK_ACTION == "None":
+        if self.cfg.fallback_action is None or self.cfg.fallback_action == "None":
             return
 
-        channel_name = str(FALLBACK_ACTION)
+        channel_name = str(self.cfg.fallback_action)
 
         try:
             self.ts3conn.clientmove(self.get_channel_by_name(channel_name), client_id)
-            del self.idling_clients[int(client_id)]
-        except KeyError:
-            IdleMover.logger.error(
-                "Error moving client! clid=%s not found in %s",
-                int(client_id),
-                str(self.idling_clients),
-            )
+            self.idling_clients.pop(int(client_id), None)
         except TS3Exception:
             IdleMover.logger.exception("Error moving client! clid=%s", int(client_id))
 
-    def move_all_back(self):
+    def move_all_back(self, back_list):
         """
         Move all clients who are not idle anymore.
+        :param back_list: Dict of the old channel IDs by the client IDs, which should be moved back.
+        :return: Number of clients, which have been moved back.
         """
-        back_list = self.get_back_list()
+        moved_clients = 0
+
         if len(back_list) == 0:
             IdleMover.logger.debug("move_all_back back list is empty. Nothing todo.")
-            return
+            return moved_clients
 
         IdleMover.logger.debug("Moving clients back")
-        IdleMover.logger.debug("Backlist is: %s", str(back_list))
-        IdleMover.logger.debug(
-            "Saved client idle list keys are: %s\n", str(self.idling_clients.keys())
-        )
+        IdleMover.logger.debug("Backlist is: %s", back_list)
+        if IdleMover.logger.isEnabledFor(logging.DEBUG):
+            IdleMover.logger.debug(
+                "Saved client idle list keys are: %s\n", list(self.idling_clients)
+            )
 
         try:
-            channel_list = self.ts3conn.channellist()
+            channel_list = self.ts3conn.channellist(["limits", "flags"])
         except TS3QueryException as query_exception:
             IdleMover.logger.error(
                 "Failed to get the current channellist: %s",
                 str(query_exception.message),
             )
-            return
+            return moved_clients
+
+        channels_by_cid = {int(channel["cid"]): channel for channel in channel_list}
+        client_clids_by_cid = {}
 
         for client_clid, client_cid in back_list.items():
             IdleMover.logger.info(
@@ -537,29 +604,14 @@ class IdleMover(Thread):
                 int(client_clid),
             )
 
-            try:
-                channel_info = self.ts3conn._parse_resp_to_dict(
-                    self.ts3conn._send("channelinfo", [f"cid={int(client_cid)}"])
-                )
-            except TS3QueryException as query_exception:
-                # Error: invalid channel ID (channel ID does not exist (anymore))
-                if int(query_exception.id) == 768:
-                    IdleMover.logger.error(
-                        "Failed to get channelinfo as the channel cid=%s does not exist anymore.",
-                        int(client_cid),
-                    )
-                    continue
-
-            channel_details = None
-            for channel in channel_list:
-                if int(channel["cid"]) == int(client_cid):
-                    channel_details = channel
-                    break
+            # a missing channel has usually been deleted meanwhile,
+            # which the error handling of clientmove takes care of
+            channel_details = channels_by_cid.get(client_cid)
 
-            if RESP_CHANNEL_SETTINGS and channel_details is not None:
-                if int(channel_info.get("channel_maxclients")) != -1 and int(
+            if self.cfg.resp_channel_settings and channel_details is not None:
+                if int(channel_details.get("channel_maxclients")) != -1 and int(
                     channel_details.get("total_clients")
-                ) >= int(channel_info.get("channel_maxclients")):
+                ) >= int(channel_details.get("channel_maxclients")):
                     IdleMover.logger.warning(
                         "Failed to move back the following client clid=%s as the channel cid=%s has already the maximum of clients.",
                         int(client_clid),
@@ -568,7 +620,7 @@ class IdleMover(Thread):
                     self.fallback_action(client_clid)
                     continue
 
-                if int(channel_info.get("channel_flag_password")):
+                if int(channel_details.get("channel_flag_password")):
                     IdleMover.logger.warning(
                         "Failed to move back the following client clid=%s as the channel cid=%s has a password.",
                         int(client_clid),
@@ -577,58 +629,173 @@ class IdleMover(Thread):
                     self.fallback_action(client_clid)
                     continue
 
+            if channel_details is not None:
+                # the client occupies a slot in the channel from now on
+                channel_details["total_clients"] = (
+                    int(channel_details.get("total_clients")) + 1
+                )
+
+            client_clids_by_cid.setdefault(client_cid, []).append(client_clid)
+
+        for client_cid, client_clids in client_clids_by_cid.items():
             try:
-                self.ts3conn.clientmove(client_cid, client_clid)
+                self.move_clients(client_cid, client_clids)
+            except TS3QueryException:
+                IdleMover.logger.warning(
+                    "Failed to move back all clients to the channel cid=%s at once. Moving them one by one.",
+                    int(client_cid),
+                )
 
-                del self.idling_clients[int(client_clid)]
-            except TS3QueryException as query_exception:
-                # Error: invalid channel ID (channel ID does not exist (anymore))
-                if int(query_exception.id) == 768:
-                    IdleMover.logger.error(
-                        "Failed to move back the following client clid=%s as the old channel cid=%s does not exist anymore.",
-                        int(client_clid),
-                        int(client_cid),
-                    )
-                # Error: channel maxclient or maxfamily reached
-                if int(query_exception.id) in (777, 778):
-                    IdleMover.logger.error(
-                        "Failed to move back the following client clid=%s as the old channel cid=%s has already the maximum of clients.",
-                        int(client_clid),
-                        int(client_cid),
-                    )
-                # Error: invalid channel password
-                if int(query_exception.id) == 781:
-                    IdleMover.logger.error(
-                        "Failed to move back the following client clid=%s as the old channel cid=%s has an unknown password.",
-                        int(client_clid),
-                        int(client_cid),
-                    )
-                else:
-                    IdleMover.logger.exception(
-                        "Failed to move back the following client clid=%s",
-                        int(client_clid),
-                    )
+                for client_clid in client_clids:
+                    if self.move_back(client_clid, client_cid):
+                        moved_clients += 1
 
-                self.fallback_action(client_clid)
+                continue
+
+            for client_clid in client_clids:
+                self.idling_clients.pop(client_clid, None)
+
+            moved_clients += len(client_clids)
+
+        return moved_clients
+
+    def move_back(self, client_clid, client_cid):
+        """
+        Move a single client back to its old channel.
+        :param client_clid: The client ID, which should be moved back.
+        :param client_cid: The channel ID, where the client was before.
+        :return: True, if the client is in its old channel now.
+        """
+        try:
+            self.ts3conn.clientmove(client_cid, client_clid)
+
+            self.idling_clients.pop(int(client_clid), None)
+        except TS3QueryException as query_exception:
+            # Error: already member of channel (moved by the failed batch)
+            if int(query_exception.id) == 770:
+                self.idling_clients.pop(int(client_clid), None)
+                return True
+
+            # Error: invalid channel ID (channel ID does not exist (anymore))
+            if int(query_exception.id) == 768:
+                IdleMover.logger.error(
+                    "Failed to move back the following client clid=%s as the old channel cid=%s does not exist anymore.",
+                    int(client_clid),
+                    int(client_cid),
+                )
+            # Error: channel maxclient or maxfamily reached
+            if int(query_exception.id) in (777, 778):
+                IdleMover.logger.error(
+                    "Failed to move back the following client clid=%s as the old channel cid=%s has already the maximum of clients.",
+                    int(client_clid),
+                    int(client_cid),
+                )
+            # Error: invalid channel password
+            if int(query_exception.id) == 781:
+                IdleMover.logger.error(
+                    "Failed to move back the following client clid=%s as the old channel cid=%s has an unknown password.",
+                    int(client_clid),
+                    int(client_cid),
+                )
+            else:
+                IdleMover.logger.exception(
+                    "Failed to move back the following client clid=%s",
+                    int(client_clid),
+                )
+
+            self.fallback_action(client_clid)
+            return False
+
+        return True
+
+    def run_once(self):
+        """
+        Performs a single check: refreshes the cached server data if necessary and moves all clients.
+        Returns early as soon as the stop signal is sent.
+        :return: Number of moved clients.
+        """
+        moved_clients = 0
+
+        # refresh on a deadline, so the back-off of the check frequency does not delay it
+        if time.monotonic() >= self.excluded_cldbids_refresh_at:
+            self.excluded_cldbids = self.update_excluded_cldbids()
+            self.excluded_cldbids_refresh_at = (
+                time.monotonic() + SERVERGROUP_MEMBERS_REFRESH_SECONDS
+            )
+
+        if time.monotonic() >= self.channel_ids_refresh_at:
+            self.channel_ids_by_name.clear()
+            self.channel_ids_refresh_at = time.monotonic() + CHANNEL_IDS_REFRESH_SECONDS
+
+            try:
+                self.afk_channel = self.get_channel_by_name(self.cfg.channel_name)
+            except TS3Exception:
+                # e.g. the afk channel has been renamed, so keep its previous channel ID
+                IdleMover.logger.error(
+                    "Failed to refresh the afk channel. Keep using the channel cid=%s.",
+                    self.afk_channel,
+                )
+
+        self.client_list = self.update_client_list()
+
+        if self.stopped.is_set():
+            return moved_clients
+
+        idle_list, back_list = self.get_idle_and_back_lists()
+
+        if self.cfg.enable_auto_move_back:
+            moved_clients += self.move_all_back(back_list)
+
+            if self.stopped.is_set():
+                return moved_clients
+
+        moved_clients += self.move_all_afk(idle_list)
+
+        return moved_clients
 
     def auto_move_all(self):
         """
         Loop move functions until the stop signal is sent.
+        The check frequency is reduced, while no client is moved and no client waits to be moved back.
         """
-        while not self.stopped.wait(float(CHECK_FREQUENCY_SECONDS)):
+        checks_without_activity = 0
+        check_frequency = self.cfg.check_frequency_seconds
+
+        while not self.stopped.wait(check_frequency):
             IdleMover.logger.debug("Plugin running!")
 
             try:
-                if ENABLE_AUTO_MOVE_BACK:
-                    self.move_all_back()
+                check_started_at = time.monotonic()
+
+                moved_clients = self.run_once()
+
+                IdleMover.logger.debug(
+                    "Check took %.3f seconds and moved %s clients.",
+                    time.monotonic() - check_started_at,
+                    moved_clients,
+                )
 
-                self.move_all_afk()
+                # clients in the afk channel only need the normal frequency to get moved back
+                if moved_clients == 0 and (
+                    not self.cfg.enable_auto_move_back or len(self.idling_clients) == 0
+                ):
+                    checks_without_activity += 1
+                else:
+                    checks_without_activity = 0
+
+                check_frequency = self.cfg.check_frequency_seconds * 2 ** min(
+                    checks_without_activity, MAX_CHECK_FREQUENCY_BACKOFF
+                )
             except BaseException:
                 IdleMover.logger.error("Uncaught exception: %s", str(sys.exc_info()[0]))
                 IdleMover.logger.error(str(sys.exc_info()[1]))
                 IdleMover.logger.error(traceback.format_exc())
 
+            # write the buffered records of this check, so they do not wait for the buffer to fill up
+            IdleMover.memory_handler.flush()
+
         IdleMover.logger.warning("Plugin stopped!")
+        IdleMover.memory_handler.flush()
 
 
 @command(f"{PLUGIN_COMMAND_NAME} version")
@@ -655,12 +822,12 @@ def start_plugin(_sender=None, _msg=None):
     """
     global PLUGIN_INFO
     if PLUGIN_INFO is None:
-        if DRY_RUN:
+        if PLUGIN_CONFIG.dry_run:
             IdleMover.logger.info(
                 "Dry run is enabled - logging actions intead of actually performing them."
             )
 
-        PLUGIN_INFO = IdleMover(PLUGIN_STOPPER, BOT.ts3conn)
+        PLUGIN_INFO = IdleMover(PLUGIN_STOPPER, BOT.ts3conn, PLUGIN_CONFIG)
         PLUGIN_STOPPER.clear()
         PLUGIN_INFO.start()
 
@@ -691,8 +858,7 @@ def client_left(event_data):
     """
     # Forget clients that were moved to the afk channel and then left
     if PLUGIN_INFO is not None:
-        if int(event_data.client_id) in PLUGIN_INFO.idling_clients:
-            del PLUGIN_INFO.idling_clients[int(event_data.client_id)]
+        PLUGIN_INFO.forget_client(event_data.client_id)
 
 
 @setup_plugin
@@ -713,22 +879,27 @@ def setup(
     """
     Sets up this plugin.
     """
-    global BOT, AUTO_START, DRY_RUN, CHECK_FREQUENCY_SECONDS, CHANNELS_TO_EXCLUDE, SERVERGROUPS_TO_EXCLUDE, ENABLE_AUTO_MOVE_BACK, RESP_CHANNEL_SETTINGS, FALLBACK_ACTION, IDLE_TIME_SECONDS, CHANNEL_NAME, CHANNEL_SETTINGS
+    global BOT, PLUGIN_CONFIG
 
     BOT = ts3bot
-    AUTO_START = auto_start
-    DRY_RUN = enable_dry_run
-    CHECK_FREQUENCY_SECONDS = frequency
-    CHANNELS_TO_EXCLUDE = exclude_channels
-    SERVERGROUPS_TO_EXCLUDE = exclude_servergroups
-    ENABLE_AUTO_MOVE_BACK = auto_move_back
-    RESP_CHANNEL_SETTINGS = respect_channel_settings
-    FALLBACK_ACTION = fallback_channel
-    IDLE_TIME_SECONDS = min_idle_time_seconds
-    CHANNEL_NAME = channel
-    CHANNEL_SETTINGS = channel_settings
-
-    if AUTO_START:
+    PLUGIN_CONFIG = IdleMoverConfig(
+        dry_run=enable_dry_run,
+        check_frequency_seconds=float(frequency),
+        channels_to_exclude=exclude_channels,
+        servergroups_to_exclude=frozenset(
+            servergroup_name.strip()
+            for servergroup_name in (exclude_servergroups or "").split(",")
+            if servergroup_name.strip()
+        ),
+        enable_auto_move_back=auto_move_back,
+        resp_channel_settings=respect_channel_settings,
+        fallback_action=fallback_channel,
+        idle_time_ms=float(min_idle_time_seconds) * 1000.0,
+        channel_name=channel,
+        channel_settings=channel_settings,
+    )
+
+    if auto_start:
         start_plugin()
 
 
@@ -743,3 +914,5 @@ def afkmover_exit():
         PLUGIN_STOPPER.set()
         PLUGIN_INFO.join()
         PLUGIN_INFO = None
+
+    IdleMover.memory_handler.flush()
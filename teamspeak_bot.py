@@ -2,6 +2,7 @@
 import configparser
 import logging
 import os
+import socket
 import sys
 
 # third-party imports
@@ -21,6 +22,34 @@ def stop_conn(ts3conn):
     ts3conn.stop_recv.set()
 
 
+def tune_conn_socket(ts3conn):
+    """
+    Disables Nagle's algorithm and enables TCP keepalive on the socket of the connection.
+    Plugins send many small queries one after another, which would otherwise get delayed.
+    :param ts3conn: TS3Connection to tune.
+    :type ts3conn: ts3API.TS3Connection
+    :return: True, if the socket has been found and tuned.
+    :rtype: bool
+    """
+    # the socket is hidden behind the wrapper of either the raw or the SSH connection
+    conn_wrapper = getattr(ts3conn, "_conn", None)
+    conn_socket = getattr(conn_wrapper, "_conn", None)
+    if conn_socket is None and getattr(conn_wrapper, "_ssh_conn", None) is not None:
+        transport = conn_wrapper._ssh_conn.get_transport()
+        conn_socket = getattr(transport, "sock", None)
+
+    if not isinstance(conn_socket, socket.socket):
+        return False
+
+    try:
+        conn_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        return False
+
+    return True
+
+
 def send_msg_to_client(ts3conn, clid, msg):
     """
     Convenience method for sending a message to a client without having a bot object.
@@ -114,6 +143,11 @@ class Ts3Bot:
             )
             raise
 
+        if not tune_conn_socket(self.ts3conn):
+            self.logger.warning(
+                "Failed to disable Nagle's algorithm on the connection socket."
+            )
+
     def setup_bot(self):
         """
         Setup routine for new bot. Does the following things: